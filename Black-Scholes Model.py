@@ -15,6 +15,9 @@ def black_scholes_price(S, K, T, r, sigma, option_type='call'):
     """
     Calculate Black-Scholes option price for European call or put.
 
+    S, K, T, r and sigma may also be arrays of unexpired contracts (T > 0)
+    to price many options of the same type in one vectorized call.
+
     Parameters:
     S : float
         Current stock price
@@ -33,7 +36,7 @@ def black_scholes_price(S, K, T, r, sigma, option_type='call'):
     float
         Option price
     """
-    if T <= 0:
+    if np.ndim(T) == 0 and T <= 0:
         # Option has expired
         if option_type.lower() == 'call':
             return max(S - K, 0.0)
@@ -59,14 +62,14 @@ def black_scholes_greeks(S, K, T, r, sigma, option_type='call'):
     Calculate Black-Scholes Greeks for European call or put.
 
     Parameters:
-    S, K, T, r, sigma : same as above
+    S, K, T, r, sigma : same as above (arrays of unexpired contracts allowed)
     option_type : 'call' or 'put'
 
     Returns:
     dict
         Dictionary containing Delta, Gamma, Theta, Vega, Rho
     """
-    if T <= 0:
+    if np.ndim(T) == 0 and T <= 0:
         # Option has expired; Greeks are not defined
         return {
             'Delta': 0.0,
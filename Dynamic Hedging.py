@@ -156,3 +156,218 @@ def calculate_max_drawdown(portfolio_values):
         if drawdown > max_dd:
             max_dd = drawdown
     return max_dd
+
+def stream_dynamic_hedging(S0, K, T, r, sigma, option_type='call',
+                           steps=252, transaction_cost=0.001, n_paths=1,
+                           chunk_size=1024, path_batch_size=1024, seed=42,
+                           legacy_stream=False):
+    """
+    Simulate dynamic delta hedging and stream the state in fixed-size chunks.
+
+    Follows the same hedging rules as simulate_dynamic_hedging, but
+    vectorised over a batch of paths and without keeping the history, so
+    memory depends only on chunk_size and path_batch_size. Path p draws
+    from its own stream spawned from SeedSequence(seed), so a seeded run
+    gives the same paths for any n_paths, chunk_size and path_batch_size.
+
+    Parameters:
+    S0, K, T, r, sigma, option_type, steps, transaction_cost :
+        same as simulate_dynamic_hedging
+    n_paths : int
+        Number of simulated paths
+    chunk_size : int
+        Maximum number of time points per chunk
+    path_batch_size : int
+        Maximum number of paths per chunk
+    seed : int or None
+        Random seed
+    legacy_stream : bool
+        Draw the single path (n_paths must be 1) from the
+        np.random.seed(seed) stream so it matches simulate_dynamic_hedging
+
+    Returns:
+    generator of dict
+        Path Start, Step Start, Times and 2-D (paths x time points) arrays
+        of Price Paths, Portfolio Values, Hedge Positions, Cash Positions
+        and Transaction Costs. The last time point of each path already
+        includes the option settlement.
+    """
+    if option_type.lower() not in ('call', 'put'):
+        raise ValueError("option_type must be 'call' or 'put'")
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if path_batch_size < 1:
+        raise ValueError("path_batch_size must be at least 1")
+    if legacy_stream and n_paths != 1:
+        raise ValueError("legacy_stream requires n_paths=1")
+    return _stream_dynamic_hedging(S0, K, T, r, sigma, option_type, steps,
+                                   transaction_cost, n_paths, chunk_size,
+                                   path_batch_size, seed, legacy_stream)
+
+def _stream_dynamic_hedging(S0, K, T, r, sigma, option_type, steps,
+                            transaction_cost, n_paths, chunk_size,
+                            path_batch_size, seed, legacy_stream):
+    dt = T / steps
+    root_seed = np.random.SeedSequence(seed)
+    option_price = black_scholes_price(S0, K, T, r, sigma, option_type)
+    delta = black_scholes_greeks(S0, K, T, r, sigma, option_type)['Delta']
+
+    for path_start in range(0, n_paths, path_batch_size):
+        batch = min(path_batch_size, n_paths - path_start)
+        S = np.full(batch, float(S0))
+        hedge = np.full(batch, -delta)
+        cost = abs(delta) * S0 * transaction_cost
+        cash = np.full(batch, option_price - delta * S0 - cost)
+        if legacy_stream:
+            # Same stream as simulate_dynamic_hedging
+            rngs = [np.random.RandomState(seed)]
+        else:
+            rngs = [np.random.default_rng(np.random.SeedSequence(root_seed.entropy,
+                                                                 spawn_key=(p,)))
+                    for p in range(path_start, path_start + batch)]
+
+        for step_start in range(0, steps + 1, chunk_size):
+            step_end = min(step_start + chunk_size, steps + 1)
+            n = step_end - step_start
+            prices = np.empty((batch, n))
+            portfolio = np.empty((batch, n))
+            hedges = np.empty((batch, n))
+            cashes = np.empty((batch, n))
+            costs = np.empty((batch, n))
+            # The first time point of a path has no price move
+            offset = 1 if step_start == 0 else 0
+            Z = np.array([rng.standard_normal(n - offset) for rng in rngs])
+
+            for j, i in enumerate(range(step_start, step_end)):
+                if i > 0:
+                    S_prev = S
+                    S = S_prev * np.exp((r - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * Z[:, j - offset])
+                    tau = max(T - i * dt, 1e-6)  # Avoid division by zero
+                    new_hedge = -black_scholes_greeks(S, K, tau, r, sigma, option_type)['Delta']
+                    cost = np.abs(new_hedge - hedge) * S * transaction_cost
+                    cash = cash * np.exp(r * dt) + hedge * (S - S_prev) - cost
+                    hedge = new_hedge
+                prices[:, j] = S
+                hedges[:, j] = hedge
+                cashes[:, j] = cash
+                costs[:, j] = cost
+                portfolio[:, j] = cash + hedge * S
+
+            if step_end == steps + 1:
+                # At maturity, settle the option
+                if option_type.lower() == 'call':
+                    portfolio[:, -1] += np.maximum(S - K, 0)
+                else:
+                    portfolio[:, -1] += np.maximum(K - S, 0)
+
+            yield {
+                'Path Start': path_start,
+                'Step Start': step_start,
+                'Times': np.arange(step_start, step_end) * dt,
+                'Price Paths': prices,
+                'Portfolio Values': portfolio,
+                'Hedge Positions': hedges,
+                'Cash Positions': cashes,
+                'Transaction Costs': costs
+            }
+
+def run_streaming_hedging(S0, K, T, r, sigma, option_type='call', steps=252,
+                          transaction_cost=0.001, n_paths=1, chunk_size=1024,
+                          path_batch_size=1024, seed=42, legacy_stream=False,
+                          sink=None):
+    """
+    Run a streaming hedging simulation and compute summary statistics online.
+
+    Chunks from stream_dynamic_hedging are passed to sink.write (for
+    example a simulation_storage.MemmapSink) and then discarded, so memory
+    stays bounded regardless of steps and n_paths.
+
+    Parameters:
+    S0, K, T, r, sigma, option_type, steps, transaction_cost, n_paths,
+    chunk_size, path_batch_size, seed, legacy_stream :
+        same as stream_dynamic_hedging
+    sink : object or None
+        Object with open(n_paths, steps, params), write(chunk) and
+        close(summary) methods. close is always called; summary is None
+        if the simulation failed.
+
+    Returns:
+    dict
+        Mean and standard deviation of the total return and final portfolio
+        value, mean and worst maximum drawdown, and mean transaction costs
+    """
+    chunks = stream_dynamic_hedging(S0, K, T, r, sigma, option_type, steps,
+                                    transaction_cost, n_paths, chunk_size,
+                                    path_batch_size, seed, legacy_stream)
+    if sink is None:
+        return _summarize_stream(chunks, S0, K, T, r, sigma, option_type, steps)
+
+    sink.open(n_paths, steps, {
+        'S0': S0, 'K': K, 'T': T, 'r': r, 'sigma': sigma,
+        'option_type': option_type, 'transaction_cost': transaction_cost,
+        'seed': seed, 'legacy_stream': legacy_stream
+    })
+    summary = None
+    try:
+        summary = _summarize_stream(chunks, S0, K, T, r, sigma, option_type,
+                                    steps, sink)
+    finally:
+        sink.close(summary)
+    return summary
+
+def _summarize_stream(chunks, S0, K, T, r, sigma, option_type, steps, sink=None):
+    option_price = black_scholes_price(S0, K, T, r, sigma, option_type)
+    # Running mean and sum of squared deviations, merged per path batch
+    count = 0
+    mean_final = 0.0
+    m2_final = 0.0
+    sum_max_dd = 0.0
+    worst_max_dd = 0.0
+    total_costs = 0.0
+
+    for chunk in chunks:
+        if sink is not None:
+            sink.write(chunk)
+
+        values = chunk['Portfolio Values']
+        if chunk['Step Start'] == 0:
+            peak = values[:, 0].copy()
+            max_dd = np.zeros(len(values))
+            path_costs = np.zeros(len(values))
+        running_peak = np.maximum(np.maximum.accumulate(values, axis=1), peak[:, None])
+        max_dd = np.maximum(max_dd, ((running_peak - values) / running_peak).max(axis=1))
+        peak = running_peak[:, -1]
+        path_costs += chunk['Transaction Costs'].sum(axis=1)
+
+        if chunk['Step Start'] + values.shape[1] == steps + 1:
+            finals = values[:, -1]
+            n_batch = len(finals)
+            diff = finals.mean() - mean_final
+            mean_final += diff * n_batch / (count + n_batch)
+            m2_final += (((finals - finals.mean())**2).sum()
+                         + diff**2 * count * n_batch / (count + n_batch))
+            count += n_batch
+            sum_max_dd += max_dd.sum()
+            worst_max_dd = max(worst_max_dd, max_dd.max())
+            total_costs += path_costs.sum()
+
+    std_final = np.sqrt(m2_final / (count - 1)) if count > 1 else 0.0
+    summary = {
+        'Paths': count,
+        'Mean Total Return': float((mean_final - option_price) / option_price),
+        'Std Total Return': float(std_final / option_price),
+        'Mean Final Portfolio Value': float(mean_final),
+        'Std Final Portfolio Value': float(std_final),
+        'Mean Maximum Drawdown': float(sum_max_dd / count),
+        'Worst Maximum Drawdown': float(worst_max_dd),
+        'Mean Transaction Costs': float(total_costs / count)
+    }
+
+    logging.info(f"Streaming Dynamic Hedging Simulation Completed ({count} paths)")
+    logging.info(f"Mean Total Return: {summary['Mean Total Return']*100:.2f}%")
+    logging.info(f"Worst Maximum Drawdown: {worst_max_dd*100:.2f}%")
+    return summary
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Variance-reduced Monte Carlo pricing of path-dependent options.
+"""
+
+### monte_carlo.py
+
+import numpy as np
+from scipy.stats import norm, qmc
+from black_scholes import black_scholes_price
+import logging
+
+def brownian_bridge(Z, T):
+    """
+    Build Brownian motion paths from standard normals using a Brownian bridge.
+
+    The first column of Z fixes the terminal value, the following columns
+    fill in midpoints by recursive bisection, so the leading (best
+    distributed) quasi-random dimensions drive the coarse path shape.
+
+    Parameters:
+    Z : ndarray
+        Standard normal draws of shape (n_paths, steps)
+    T : float
+        Time horizon (in years)
+
+    Returns:
+    ndarray
+        Brownian motion values of shape (n_paths, steps + 1), starting at 0
+    """
+    n_paths, steps = Z.shape
+    dt = T / steps
+    W = np.zeros((n_paths, steps + 1))
+    W[:, steps] = np.sqrt(T) * Z[:, 0]
+
+    k = 1
+    intervals = [(0, steps)]
+    while intervals:
+        next_intervals = []
+        for left, right in intervals:
+            mid = (left + right) // 2
+            if mid == left:
+                continue
+            mean = ((right - mid) * W[:, left] + (mid - left) * W[:, right]) / (right - left)
+            std = np.sqrt((mid - left) * (right - mid) / (right - left) * dt)
+            W[:, mid] = mean + std * Z[:, k]
+            k += 1
+            next_intervals.extend([(left, mid), (mid, right)])
+        intervals = next_intervals
+    return W
+
+def _draw_normals(n_draws, steps, rng=None, sampler=None):
+    """
+    Draw standard normals of shape (n_draws, steps) from rng or a Sobol sampler.
+    """
+    if sampler is not None:
+        U = sampler.random(n_draws)
+        return norm.ppf(np.clip(U, 1e-12, 1 - 1e-12))
+    return rng.standard_normal((n_draws, steps))
+
+def _build_paths(Z, S0, T, r, sigma, antithetic, bridge):
+    """
+    Turn standard normals into GBM price paths.
+    """
+    steps = Z.shape[1]
+    if antithetic:
+        Z = np.vstack([Z, -Z])
+
+    if bridge:
+        W = brownian_bridge(Z, T)
+    else:
+        dt = T / steps
+        W = np.zeros((Z.shape[0], steps + 1))
+        W[:, 1:] = np.cumsum(np.sqrt(dt) * Z, axis=1)
+
+    times = np.linspace(0, T, steps + 1)
+    return S0 * np.exp((r - 0.5 * sigma**2) * times + sigma * W)
+
+def simulate_gbm_paths(S0, T, r, sigma, steps=252, n_paths=10000,
+                       antithetic=True, sobol=False, seed=42):
+    """
+    Simulate Geometric Brownian Motion price paths.
+
+    Uses the same risk-neutral dynamics as simulate_dynamic_hedging.
+
+    Parameters:
+    S0 : float
+        Initial stock price
+    T : float
+        Time to maturity (in years)
+    r : float
+        Risk-free rate
+    sigma : float
+        Volatility
+    steps : int
+        Number of time steps
+    n_paths : int
+        Number of paths (rounded up to an even number when antithetic)
+    antithetic : bool
+        Pair every path with its mirrored draw (-Z); the pair for path i
+        is path i + n_paths // 2
+    sobol : bool
+        Use scrambled Sobol draws with Brownian-bridge construction
+    seed : int, Generator or None
+        Seed for the random number generator or Sobol scrambling
+
+    Returns:
+    ndarray
+        Price paths of shape (n_paths, steps + 1)
+    """
+    n_draws = (n_paths + 1) // 2 if antithetic else n_paths
+
+    if sobol:
+        sampler = qmc.Sobol(d=steps, scramble=True, seed=seed)
+        # Sobol points are balanced only in powers of two
+        m = int(np.ceil(np.log2(max(n_draws, 1))))
+        U = sampler.random_base2(m)[:n_draws]
+        Z = norm.ppf(np.clip(U, 1e-12, 1 - 1e-12))
+    else:
+        Z = _draw_normals(n_draws, steps, rng=np.random.default_rng(seed))
+
+    return _build_paths(Z, S0, T, r, sigma, antithetic, sobol)
+
+def path_payoff(price_paths, K, option_type='call', payoff='asian',
+                barrier=None, barrier_type='up-and-out'):
+    """
+    Calculate the undiscounted payoff of each simulated path.
+
+    Parameters:
+    price_paths : ndarray
+        Price paths of shape (n_paths, steps + 1)
+    K : float
+        Strike price
+    option_type : str
+        'call' or 'put'
+    payoff : str
+        'european', 'asian' (arithmetic average), 'barrier' or 'lookback'
+        (fixed strike on the path maximum for calls, minimum for puts)
+    barrier : float
+        Barrier level, required when payoff is 'barrier'
+    barrier_type : str
+        'up-and-out', 'up-and-in', 'down-and-out' or 'down-and-in'
+
+    Returns:
+    ndarray
+        Payoff per path
+    """
+    option_type = option_type.lower()
+    payoff = payoff.lower()
+    if option_type not in ('call', 'put'):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    if payoff in ('european', 'barrier'):
+        S_ref = price_paths[:, -1]
+    elif payoff == 'asian':
+        # Average over monitoring dates, excluding the initial fixing
+        S_ref = price_paths[:, 1:].mean(axis=1)
+    elif payoff == 'lookback':
+        S_ref = price_paths.max(axis=1) if option_type == 'call' else price_paths.min(axis=1)
+    else:
+        raise ValueError("payoff must be 'european', 'asian', 'barrier' or 'lookback'")
+
+    if option_type == 'call':
+        values = np.maximum(S_ref - K, 0.0)
+    else:
+        values = np.maximum(K - S_ref, 0.0)
+
+    if payoff == 'barrier':
+        if barrier is None:
+            raise ValueError("barrier is required for barrier payoffs")
+        barrier_type = barrier_type.lower()
+        if barrier_type.startswith('up'):
+            hit = price_paths.max(axis=1) >= barrier
+        elif barrier_type.startswith('down'):
+            hit = price_paths.min(axis=1) <= barrier
+        else:
+            raise ValueError("barrier_type must be 'up-and-out', 'up-and-in', "
+                             "'down-and-out' or 'down-and-in'")
+        if barrier_type.endswith('out'):
+            values = np.where(hit, 0.0, values)
+        elif barrier_type.endswith('in'):
+            values = np.where(hit, values, 0.0)
+        else:
+            raise ValueError("barrier_type must be 'up-and-out', 'up-and-in', "
+                             "'down-and-out' or 'down-and-in'")
+    return values
+
+MIN_PILOT_PATHS = 1000
+
+def _pow2_floor(n):
+    """
+    Largest power of two not greater than n (n >= 1).
+    """
+    return 1 << (int(n).bit_length() - 1)
+
+def _new_state(rng=None, sampler=None):
+    """
+    Create the running sums for one independent Monte Carlo estimate.
+
+    Payoffs are accumulated as sums around a shift (the first batch mean)
+    so the variance formulas do not lose precision on large path counts.
+    """
+    return {'rng': rng, 'sampler': sampler, 'paths': 0, 'n': 0,
+            'shift_y': None, 'shift_x': None,
+            'y': 0.0, 'yy': 0.0, 'x': 0.0, 'xx': 0.0, 'xy': 0.0}
+
+def _extend(state, n_paths, batch_size, S0, K, T, r, sigma, option_type,
+            payoff, barrier, barrier_type, steps, antithetic):
+    """
+    Simulate n_paths more paths in batches of at most batch_size and add
+    their payoffs to the running sums in state.
+
+    With antithetic pairs, n_paths and batch_size are rounded down to an
+    even number (at least one pair), so no more than n_paths are simulated
+    unless n_paths is 1.
+    """
+    discount = np.exp(-r * T)
+    remaining = n_paths
+    if antithetic:
+        remaining = max(remaining - remaining % 2, 2)
+        batch_size = max(batch_size - batch_size % 2, 2)
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        n_draws = (batch + 1) // 2 if antithetic else batch
+        Z = _draw_normals(n_draws, steps, state['rng'], state['sampler'])
+        paths = _build_paths(Z, S0, T, r, sigma, antithetic,
+                             state['sampler'] is not None)
+        Y = discount * path_payoff(paths, K, option_type, payoff, barrier, barrier_type)
+        # Discounted European payoff has known mean black_scholes_price
+        X = discount * path_payoff(paths, K, option_type, 'european')
+        if antithetic:
+            # Antithetic pairs are the independent samples
+            Y = 0.5 * (Y[:n_draws] + Y[n_draws:])
+            X = 0.5 * (X[:n_draws] + X[n_draws:])
+
+        if state['shift_y'] is None:
+            state['shift_y'] = Y.mean()
+            state['shift_x'] = X.mean()
+        Y = Y - state['shift_y']
+        X = X - state['shift_x']
+        state['n'] += len(Y)
+        state['y'] += Y.sum()
+        state['yy'] += (Y * Y).sum()
+        state['x'] += X.sum()
+        state['xx'] += (X * X).sum()
+        state['xy'] += (X * Y).sum()
+        state['paths'] += paths.shape[0]
+        remaining -= paths.shape[0]
+
+def _summarize(state, X_mean, control_variate):
+    """
+    Return (price, standard error) from the running sums in state.
+    """
+    n = state['n']
+    mean_y = state['y'] / n
+    mean_x = state['x'] / n
+    price = state['shift_y'] + mean_y
+    if n < 2:
+        return price, np.inf
+
+    var_y = (state['yy'] - n * mean_y**2) / (n - 1)
+    if control_variate:
+        var_x = (state['xx'] - n * mean_x**2) / (n - 1)
+        cov = (state['xy'] - n * mean_x * mean_y) / (n - 1)
+        if var_x > 0:
+            beta = cov / var_x
+            price -= beta * (state['shift_x'] + mean_x - X_mean)
+            var_y -= beta * cov
+    return price, np.sqrt(max(var_y, 0.0) / n)
+
+def monte_carlo_price(S0, K, T, r, sigma, option_type='call', payoff='asian',
+                      barrier=None, barrier_type='up-and-out', steps=252,
+                      n_paths=10000, antithetic=True, control_variate=True,
+                      sobol=False, n_replicates=16, tolerance=None,
+                      max_paths=1000000, batch_size=8192, seed=42):
+    """
+    Price a path-dependent option by variance-reduced Monte Carlo.
+
+    Combines antithetic variates, a control variate on the discounted
+    European payoff (whose mean is the closed-form black_scholes_price)
+    and, optionally, randomized quasi-Monte Carlo. With sobol=True the
+    paths are split into n_replicates independently scrambled Sobol sets
+    (a power of two each, rounded down) and the standard error is taken
+    from the spread of their estimates. Each set holds at least 2 paths,
+    so the total goes up to 2 * n_replicates when n_paths is smaller; any
+    adjustment of n_paths is logged.
+
+    Paths are simulated in batches of batch_size and only running sums
+    are kept, so memory does not grow with the number of paths.
+
+    When a tolerance is given, n_paths (at least MIN_PILOT_PATHS) is used
+    as a pilot run and more paths are added until the requested standard
+    error is reached or max_paths is used up.
+
+    Parameters:
+    S0, K, T, r, sigma : same as black_scholes_price
+    option_type : str
+        'call' or 'put'
+    payoff : str
+        'european', 'asian', 'barrier' or 'lookback'
+    barrier : float
+        Barrier level for barrier payoffs
+    barrier_type : str
+        'up-and-out', 'up-and-in', 'down-and-out' or 'down-and-in'
+    steps : int
+        Number of monitoring steps
+    n_paths : int
+        Number of paths (pilot size when tolerance is set); rounded down
+        to an even number with antithetic variates
+    antithetic : bool
+        Use antithetic variates
+    control_variate : bool
+        Use the Black-Scholes price as a control variate
+    sobol : bool
+        Use scrambled Sobol draws with Brownian-bridge construction
+    n_replicates : int
+        Number of independent Sobol scramblings (sobol only, at least 2)
+    tolerance : float or None
+        Target standard error of the price
+    max_paths : int
+        Maximum number of paths when targeting a tolerance
+    batch_size : int
+        Maximum number of paths simulated at once
+    seed : int or None
+        Random seed
+
+    Returns:
+    dict
+        Price, Standard Error, Paths and Tolerance Met
+    """
+    if T <= 0:
+        raise ValueError("T must be positive for Monte Carlo pricing")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+    if batch_size < 2:
+        raise ValueError("batch_size must be at least 2")
+    if tolerance is not None and tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    if sobol and n_replicates < 2:
+        raise ValueError("n_replicates must be at least 2 to estimate the standard error")
+
+    X_mean = black_scholes_price(S0, K, T, r, sigma, option_type)
+    args = (S0, K, T, r, sigma, option_type, payoff, barrier, barrier_type,
+            steps, antithetic)
+    target = n_paths
+    if tolerance is not None:
+        target = min(max(n_paths, MIN_PILOT_PATHS), max_paths)
+        if antithetic and not sobol:
+            # Whole antithetic pairs only, so max_paths is never exceeded
+            if max_paths < 2:
+                raise ValueError("max_paths must be at least 2 with antithetic variates")
+            target -= target % 2
+
+    if not sobol:
+        state = _new_state(rng=np.random.default_rng(seed))
+        _extend(state, target, batch_size, *args)
+        price, std_error = _summarize(state, X_mean, control_variate)
+        while (tolerance is not None and std_error > tolerance
+               and state['paths'] < max_paths):
+            used = state['paths']
+            # Standard error scales as 1 / sqrt(paths)
+            if np.isfinite(std_error):
+                required = int(np.ceil(used * (std_error / tolerance)**2))
+            else:
+                required = 2 * used
+            extra = min(max(required - used, used // 10, 1), max_paths - used)
+            if antithetic:
+                extra -= extra % 2
+                if extra == 0:
+                    break
+            _extend(state, extra, batch_size, *args)
+            price, std_error = _summarize(state, X_mean, control_variate)
+        used = state['paths']
+    else:
+        if tolerance is not None and max_paths < 2 * n_replicates:
+            raise ValueError("max_paths must be at least 2 * n_replicates with sobol")
+        # Keep each scrambled set and each batch a power of two for Sobol balance
+        per_replicate = _pow2_floor(max(target // n_replicates, 2))
+        if per_replicate * n_replicates != target:
+            logging.warning(f"Sobol path count adjusted from {target} to "
+                            f"{per_replicate * n_replicates} ({n_replicates} "
+                            f"replicates of {per_replicate})")
+        max_per_replicate = _pow2_floor(max_paths // n_replicates) if tolerance is not None else None
+        sobol_batch = _pow2_floor(batch_size)
+        states = [_new_state(sampler=qmc.Sobol(d=steps, scramble=True,
+                                               seed=np.random.default_rng(s)))
+                  for s in np.random.SeedSequence(seed).spawn(n_replicates)]
+
+        def grow(size):
+            # Double each replicate so its size stays a power of two
+            for state in states:
+                if state['paths'] == 0:
+                    _extend(state, size, sobol_batch, *args)
+                while state['paths'] < size:
+                    _extend(state, state['paths'], sobol_batch, *args)
+
+        def combine():
+            prices = np.array([_summarize(state, X_mean, control_variate)[0]
+                               for state in states])
+            return np.mean(prices), np.std(prices, ddof=1) / np.sqrt(n_replicates)
+
+        grow(per_replicate)
+        price, std_error = combine()
+        while tolerance is not None and std_error > tolerance:
+            used = per_replicate * n_replicates
+            required = used * (std_error / tolerance)**2
+            new_size = per_replicate
+            while new_size * n_replicates < required and new_size * 2 <= max_per_replicate:
+                new_size *= 2
+            if new_size == per_replicate:
+                break
+            per_replicate = new_size
+            grow(per_replicate)
+            price, std_error = combine()
+        used = sum(state['paths'] for state in states)
+
+    tolerance_met = bool(tolerance is None or std_error <= tolerance)
+    if not tolerance_met:
+        logging.warning(f"Tolerance {tolerance} not met with {used} paths "
+                        f"(standard error {std_error:.6f})")
+
+    logging.info(f"Monte Carlo {payoff} {option_type} price: {price:.4f} "
+                 f"(standard error {std_error:.6f}, {used} paths)")
+
+    return {
+        'Price': float(price),
+        'Standard Error': float(std_error),
+        'Paths': used,
+        'Tolerance Met': tolerance_met
+    }
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-batching asyncio server for Black-Scholes prices and Greeks.
+"""
+
+### pricing_server.py
+
+import asyncio
+import json
+import math
+import time
+import numpy as np
+from black_scholes import black_scholes_price, black_scholes_greeks
+import logging
+
+GREEKS = ['Delta', 'Gamma', 'Theta', 'Vega', 'Rho']
+
+def evaluate_batch(contracts):
+    """
+    Price a batch of contracts with one vectorized call per option type.
+
+    Parameters:
+    contracts : list of tuple
+        (S, K, T, r, sigma, option_type) per contract
+
+    Returns:
+    list of dict
+        Price and Greeks per contract, in input order
+    """
+    results = [None] * len(contracts)
+    for option_type in ('call', 'put'):
+        idx = [i for i, c in enumerate(contracts) if c[5] == option_type and c[2] > 0]
+        if not idx:
+            continue
+        S, K, T, r, sigma = np.array([contracts[i][:5] for i in idx], dtype=float).T
+        prices = black_scholes_price(S, K, T, r, sigma, option_type)
+        greeks = black_scholes_greeks(S, K, T, r, sigma, option_type)
+        for j, i in enumerate(idx):
+            result = {'Price': float(prices[j])}
+            result.update({g: float(greeks[g][j]) for g in GREEKS})
+            results[i] = result
+
+    # Expired contracts are rare; price them one by one
+    for i, c in enumerate(contracts):
+        if results[i] is None:
+            result = {'Price': float(black_scholes_price(*c))}
+            result.update({g: float(v) for g, v in black_scholes_greeks(*c).items()})
+            results[i] = result
+    return results
+
+class PricingBatcher:
+    """
+    Collect concurrent pricing requests into micro-batches.
+
+    Requests arriving within window seconds of the first queued request
+    (up to max_batch_size) are evaluated together by evaluate_batch and
+    the results are fanned back out to each caller. Requests still queued
+    or in flight when the batcher is stopped fail with RuntimeError.
+
+    Parameters:
+    window : float
+        Batching window in seconds
+    max_batch_size : int
+        Maximum number of contracts per batch
+    """
+
+    def __init__(self, window=0.002, max_batch_size=4096):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        # Created in start() so the queue belongs to the running loop
+        self.queue = None
+        self.task = None
+        self.batch = []
+        self.closed = False
+        self.n_requests = 0
+        self.n_batches = 0
+        self.max_batch = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self.closed = True
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+        # Fail the in-flight batch and everything still queued
+        pending = self.batch
+        self.batch = []
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("pricing server is shutting down"))
+
+    async def price(self, S, K, T, r, sigma, option_type='call'):
+        """
+        Price one contract through the batcher.
+
+        S, K and sigma must be positive and all numeric inputs finite;
+        otherwise ValueError is raised.
+
+        Returns:
+        dict
+            Price, Delta, Gamma, Theta, Vega, Rho
+        """
+        option_type = option_type.lower()
+        if option_type not in ('call', 'put'):
+            raise ValueError("option_type must be 'call' or 'put'")
+        contract = (float(S), float(K), float(T), float(r), float(sigma), option_type)
+        for name, value in zip(('S', 'K', 'T', 'r', 'sigma'), contract):
+            if not math.isfinite(value):
+                raise ValueError(f"{name} must be finite")
+        for name, value in (('S', contract[0]), ('K', contract[1]), ('sigma', contract[4])):
+            if value <= 0:
+                raise ValueError(f"{name} must be positive")
+        if self.closed:
+            raise RuntimeError("pricing server is shutting down")
+        future = asyncio.get_running_loop().create_future()
+        self.start()
+        await self.queue.put((contract, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        while True:
+            self.batch = [await self.queue.get()]
+            await asyncio.sleep(self.window)
+            while len(self.batch) < self.max_batch_size and not self.queue.empty():
+                self.batch.append(self.queue.get_nowait())
+            batch, self.batch = self.batch, []
+            self._process(batch)
+
+    def _process(self, batch):
+        try:
+            results = evaluate_batch([contract for contract, _, _ in batch])
+        except Exception as e:
+            logging.error(f"Error pricing batch of {len(batch)}: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        for (_, future, start), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+            latency = now - start
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        self.n_requests += len(batch)
+        self.n_batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+
+    def metrics(self):
+        """
+        Return batching and latency metrics.
+
+        Returns:
+        dict
+            Requests, Batches, Mean/Max Batch Size and Mean/Max Latency (ms)
+        """
+        return {
+            'Requests': self.n_requests,
+            'Batches': self.n_batches,
+            'Mean Batch Size': self.n_requests / self.n_batches if self.n_batches else 0.0,
+            'Max Batch Size': self.max_batch,
+            'Mean Latency (ms)': 1000 * self.total_latency / self.n_requests if self.n_requests else 0.0,
+            'Max Latency (ms)': 1000 * self.max_latency
+        }
+
+async def _handle_line(line, batcher, writer):
+    request = {}
+    try:
+        request = json.loads(line)
+        if request.get('op') == 'metrics':
+            response = batcher.metrics()
+        else:
+            response = await batcher.price(request['S'], request['K'], request['T'],
+                                           request['r'], request['sigma'],
+                                           request.get('option_type', 'call'))
+    except Exception as e:
+        response = {'error': str(e)}
+    if isinstance(request, dict) and 'id' in request:
+        response = dict(response, id=request['id'])
+    try:
+        text = json.dumps(response, allow_nan=False)
+    except ValueError as e:
+        error = {'error': str(e)}
+        if 'id' in response:
+            error['id'] = response['id']
+        text = json.dumps(error)
+    writer.write((text + '\n').encode())
+
+async def handle_client(reader, writer, batcher):
+    """
+    Serve newline-delimited JSON requests from one connection.
+
+    Each line is either a contract {"S", "K", "T", "r", "sigma",
+    "option_type", optional "id"} or {"op": "metrics"}. Lines are handled
+    concurrently, so responses may arrive out of order; callers match
+    them by "id".
+    """
+    tasks = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            task = asyncio.create_task(_handle_line(line, batcher, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await writer.drain()
+        if tasks:
+            await asyncio.gather(*tasks)
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(host='127.0.0.1', port=8765, window=0.002, max_batch_size=4096):
+    """
+    Run the micro-batching pricing server until cancelled.
+
+    Parameters:
+    host : str
+        Interface to bind
+    port : int
+        TCP port
+    window : float
+        Batching window in seconds
+    max_batch_size : int
+        Maximum number of contracts per batch
+    """
+    batcher = PricingBatcher(window, max_batch_size)
+    batcher.start()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, batcher), host, port)
+    logging.info(f"Pricing server listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+        logging.info(f"Pricing server stopped: {batcher.metrics()}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped storage for streamed hedging simulations.
+"""
+
+### simulation_storage.py
+
+import json
+import os
+import numpy as np
+import logging
+
+FIELDS = ['Price Paths', 'Portfolio Values', 'Hedge Positions',
+          'Cash Positions', 'Transaction Costs']
+
+def _file_name(field):
+    return field.lower().replace(' ', '_') + '.npy'
+
+class MemmapSink:
+    """
+    Write streamed simulation chunks to memory-mapped .npy files.
+
+    Each field of stream_dynamic_hedging is stored as an
+    (n_paths, steps + 1) array in its own file, alongside a metadata.json
+    with the simulation parameters and summary statistics. Only the chunk
+    being written is held in memory. The array shapes are set by
+    run_streaming_hedging through open(), so they always match the run.
+
+    Parameters:
+    directory : str
+        Output directory (created if missing)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.n_paths = None
+        self.steps = None
+        self.params = {}
+        self.arrays = {}
+
+    def open(self, n_paths, steps, params=None):
+        """
+        Create the memory-mapped arrays for a run of n_paths paths.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.n_paths = n_paths
+        self.steps = steps
+        self.params = params or {}
+        self.arrays = {
+            field: np.lib.format.open_memmap(
+                os.path.join(self.directory, _file_name(field)), mode='w+',
+                dtype=np.float64, shape=(n_paths, steps + 1))
+            for field in FIELDS
+        }
+
+    def write(self, chunk):
+        """
+        Store one chunk from stream_dynamic_hedging.
+        """
+        if not self.arrays:
+            raise ValueError("MemmapSink.open must be called before write")
+        p0 = chunk['Path Start']
+        s0 = chunk['Step Start']
+        rows, cols = chunk['Portfolio Values'].shape
+        if p0 + rows > self.n_paths or s0 + cols > self.steps + 1:
+            raise ValueError(f"Chunk at path {p0}, step {s0} does not fit a "
+                             f"simulation of {self.n_paths} paths and {self.steps} steps")
+        for field in FIELDS:
+            self.arrays[field][p0:p0 + rows, s0:s0 + cols] = chunk[field]
+
+    def close(self, summary=None):
+        """
+        Flush the arrays to disk and write the metadata file.
+
+        A summary of None marks the saved simulation as incomplete.
+        """
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+        metadata = {
+            'n_paths': self.n_paths,
+            'steps': self.steps,
+            'params': self.params,
+            'complete': summary is not None,
+            'summary': {k: float(v) for k, v in (summary or {}).items()}
+        }
+        with open(os.path.join(self.directory, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+        if summary is None:
+            logging.warning(f"Saved incomplete simulation to {self.directory}")
+        else:
+            logging.info(f"Saved simulation to {self.directory}")
+
+def load_simulation(directory):
+    """
+    Reload a simulation saved by MemmapSink without re-simulating.
+
+    Parameters:
+    directory : str
+        Directory written by MemmapSink
+
+    Returns:
+    dict
+        Read-only memory-mapped arrays keyed by field name, plus
+        'Metadata' with the parameters, summary statistics and whether
+        the run completed
+    """
+    with open(os.path.join(directory, 'metadata.json')) as f:
+        metadata = json.load(f)
+    results = {
+        field: np.load(os.path.join(directory, _file_name(field)), mmap_mode='r')
+        for field in FIELDS
+    }
+    results['Metadata'] = metadata
+    return results
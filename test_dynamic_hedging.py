@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checks for the streaming dynamic hedging simulation and its storage.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')  # simulate_dynamic_hedging calls plt.show()
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _load(name, file_name):
+    # Project modules live in files whose names are not importable as-is
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, file_name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+_load('black_scholes', 'Black-Scholes Model.py')
+dynamic_hedging = _load('dynamic_hedging', 'Dynamic Hedging.py')
+simulation_storage = _load('simulation_storage', 'Simulation-Storage.py')
+
+CONTRACT = dict(S0=100, K=105, T=0.5, r=0.03, sigma=0.25)
+FIELDS = ['Price Paths', 'Portfolio Values', 'Hedge Positions',
+          'Cash Positions', 'Transaction Costs']
+
+def _collect(**kwargs):
+    chunks = list(dynamic_hedging.stream_dynamic_hedging(**CONTRACT, **kwargs))
+    n_paths = kwargs.get('n_paths', 1)
+    steps = kwargs['steps']
+    arrays = {field: np.empty((n_paths, steps + 1)) for field in FIELDS}
+    for chunk in chunks:
+        rows, cols = chunk['Portfolio Values'].shape
+        p0, s0 = chunk['Path Start'], chunk['Step Start']
+        for field in FIELDS:
+            arrays[field][p0:p0 + rows, s0:s0 + cols] = chunk[field]
+    return arrays
+
+def test_legacy_stream_matches_simulate_dynamic_hedging():
+    with np.errstate(divide='ignore'):
+        ref = dynamic_hedging.simulate_dynamic_hedging(**CONTRACT, steps=252)
+    arrays = _collect(steps=252, chunk_size=50, legacy_stream=True)
+    for field in FIELDS:
+        assert np.array_equal(arrays[field][0], np.asarray(ref[field]))
+
+def test_legacy_stream_requires_single_path():
+    with pytest.raises(ValueError):
+        dynamic_hedging.stream_dynamic_hedging(**CONTRACT, n_paths=2, legacy_stream=True)
+
+def test_paths_do_not_depend_on_n_paths():
+    one = _collect(steps=100, n_paths=1)
+    three = _collect(steps=100, n_paths=3, chunk_size=7, path_batch_size=2)
+    assert np.array_equal(one['Price Paths'][0], three['Price Paths'][0])
+
+def test_summary_does_not_depend_on_chunking():
+    params = dict(CONTRACT, steps=100, n_paths=10)
+    a = dynamic_hedging.run_streaming_hedging(**params, chunk_size=30, path_batch_size=4)
+    b = dynamic_hedging.run_streaming_hedging(**params, chunk_size=101, path_batch_size=10)
+    for key in a:
+        assert a[key] == pytest.approx(b[key], rel=1e-10, abs=1e-12)
+
+def test_memmap_round_trip_matches_online_summary(tmp_path):
+    directory = str(tmp_path / 'run')
+    summary = dynamic_hedging.run_streaming_hedging(
+        **CONTRACT, option_type='put', steps=60, n_paths=25, chunk_size=16,
+        path_batch_size=7, sink=simulation_storage.MemmapSink(directory))
+    saved = simulation_storage.load_simulation(directory)
+
+    assert saved['Metadata']['complete']
+    assert saved['Metadata']['n_paths'] == 25
+    values = saved['Portfolio Values']
+    finals = values[:, -1]
+    drawdowns = [dynamic_hedging.calculate_max_drawdown(path) for path in values]
+    assert finals.mean() == pytest.approx(summary['Mean Final Portfolio Value'])
+    assert finals.std(ddof=1) == pytest.approx(summary['Std Final Portfolio Value'])
+    assert np.mean(drawdowns) == pytest.approx(summary['Mean Maximum Drawdown'])
+    assert max(drawdowns) == pytest.approx(summary['Worst Maximum Drawdown'])
+    assert saved['Transaction Costs'].sum(axis=1).mean() == pytest.approx(
+        summary['Mean Transaction Costs'])
+
+class _FailingSink(simulation_storage.MemmapSink):
+    def write(self, chunk):
+        if chunk['Step Start'] > 0:
+            raise RuntimeError("disk full")
+        super().write(chunk)
+
+def test_failed_run_is_marked_incomplete(tmp_path):
+    directory = str(tmp_path / 'run')
+    with pytest.raises(RuntimeError):
+        dynamic_hedging.run_streaming_hedging(**CONTRACT, steps=30, n_paths=3,
+                                              chunk_size=10,
+                                              sink=_FailingSink(directory))
+    with open(os.path.join(directory, 'metadata.json')) as f:
+        assert json.load(f)['complete'] is False
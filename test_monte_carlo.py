@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checks for the variance-reduced Monte Carlo pricer.
+"""
+
+import importlib.util
+import os
+import sys
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _load(name, file_name):
+    # Project modules live in files whose names are not importable as-is
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, file_name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+black_scholes = _load('black_scholes', 'Black-Scholes Model.py')
+monte_carlo = _load('monte_carlo', 'Monte-Carlo.py')
+
+CONTRACT = dict(S0=100, K=100, T=1, r=0.05, sigma=0.2)
+PARAMS = dict(CONTRACT, steps=64, n_paths=8192)
+
+def test_european_control_variate_reproduces_black_scholes():
+    result = monte_carlo.monte_carlo_price(payoff='european', **PARAMS)
+    expected = black_scholes.black_scholes_price(100, 100, 1, 0.05, 0.2)
+    assert result['Price'] == pytest.approx(expected, abs=1e-8)
+    assert result['Standard Error'] < 1e-8
+
+def test_variance_reduction_beats_plain_monte_carlo():
+    plain = monte_carlo.monte_carlo_price(payoff='asian', antithetic=False,
+                                          control_variate=False, **PARAMS)
+    reduced = monte_carlo.monte_carlo_price(payoff='asian', **PARAMS)
+    sobol = monte_carlo.monte_carlo_price(payoff='asian', sobol=True, **PARAMS)
+    assert reduced['Paths'] == plain['Paths'] == sobol['Paths']
+    # Standard error ratio r means r**2 times fewer paths for equal precision
+    assert reduced['Standard Error'] < plain['Standard Error'] / 2
+    assert sobol['Standard Error'] < plain['Standard Error'] / 10
+    assert abs(sobol['Price'] - plain['Price']) < 4 * plain['Standard Error']
+
+def test_tolerance_from_tiny_pilot():
+    result = monte_carlo.monte_carlo_price(payoff='asian', steps=32, n_paths=1,
+                                           antithetic=False, tolerance=0.01,
+                                           **CONTRACT)
+    assert result['Tolerance Met']
+    assert result['Standard Error'] <= 0.01
+
+def test_sobol_respects_max_paths():
+    result = monte_carlo.monte_carlo_price(payoff='asian', steps=32, sobol=True,
+                                           n_paths=1000, tolerance=1e-6,
+                                           max_paths=50000, **CONTRACT)
+    assert result['Paths'] <= 50000
+    assert not result['Tolerance Met']
+
+def test_antithetic_respects_odd_max_paths():
+    result = monte_carlo.monte_carlo_price(payoff='asian', steps=16, n_paths=1001,
+                                           tolerance=1e-9, max_paths=3001,
+                                           batch_size=999, **CONTRACT)
+    assert result['Paths'] <= 3001
+    assert not result['Tolerance Met']
+
+def test_sobol_requires_two_replicates():
+    with pytest.raises(ValueError):
+        monte_carlo.monte_carlo_price(payoff='asian', sobol=True, n_replicates=1, **PARAMS)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checks for the micro-batching pricing server.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _load(name, file_name):
+    # Project modules live in files whose names are not importable as-is
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, file_name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+black_scholes = _load('black_scholes', 'Black-Scholes Model.py')
+pricing_server = _load('pricing_server', 'Pricing-Server.py')
+
+CONTRACTS = [
+    (100.0, 100.0, 1.0, 0.05, 0.2, 'call'),
+    (90.0, 100.0, 0.5, 0.03, 0.25, 'put'),
+    (110.0, 100.0, 0.0, 0.05, 0.2, 'call'),
+    (95.0, 100.0, -0.1, 0.05, 0.2, 'put'),
+    (120.0, 80.0, 2.0, 0.01, 0.4, 'call'),
+    (80.0, 120.0, 0.25, 0.02, 0.3, 'put'),
+]
+
+def _expected(contract):
+    result = {'Price': black_scholes.black_scholes_price(*contract)}
+    result.update(black_scholes.black_scholes_greeks(*contract))
+    return result
+
+def test_evaluate_batch_matches_scalar_calls():
+    results = pricing_server.evaluate_batch(CONTRACTS)
+    for contract, result in zip(CONTRACTS, results):
+        expected = _expected(contract)
+        assert set(result) == set(expected)
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value, rel=1e-12, abs=1e-12)
+
+def test_concurrent_requests_are_batched_in_order():
+    contracts = [(50.0 + i, 100.0, 1.0, 0.05, 0.2, 'put' if i % 2 else 'call')
+                 for i in range(200)]
+
+    async def run():
+        batcher = pricing_server.PricingBatcher(window=0.01)
+        try:
+            results = await asyncio.gather(*[batcher.price(*c) for c in contracts])
+        finally:
+            await batcher.stop()
+        return results, batcher.metrics()
+
+    results, metrics = asyncio.run(run())
+    assert metrics['Requests'] == len(contracts)
+    assert metrics['Batches'] < len(contracts)
+    for contract, result in zip(contracts, results):
+        assert result['Price'] == pytest.approx(black_scholes.black_scholes_price(*contract))
+
+def test_stop_fails_queued_and_in_flight_requests():
+    async def run():
+        batcher = pricing_server.PricingBatcher(window=0.5, max_batch_size=3)
+        tasks = [asyncio.ensure_future(batcher.price(100, 100, 1, 0.05, 0.2))
+                 for _ in range(10)]
+        await asyncio.sleep(0.05)  # first request is now in flight
+        await asyncio.wait_for(batcher.stop(), 1)
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_server_returns_errors_with_id():
+    requests = [
+        {'id': 1, 'S': 100, 'K': 100, 'T': 1, 'r': 0.05, 'sigma': 0},
+        {'id': 2, 'S': 'nan', 'K': 100, 'T': 1, 'r': 0.05, 'sigma': 0.2},
+        {'id': 3, 'S': 100, 'K': 100, 'T': 1, 'r': 0.05, 'sigma': 0.2, 'option_type': 'straddle'},
+        {'id': 4, 'K': 100, 'T': 1, 'r': 0.05, 'sigma': 0.2},
+        {'id': 5, 'S': 100, 'K': 100, 'T': 1, 'r': 0.05, 'sigma': 0.2},
+    ]
+
+    async def run():
+        batcher = pricing_server.PricingBatcher()
+        server = await asyncio.start_server(
+            lambda reader, writer: pricing_server.handle_client(reader, writer, batcher),
+            '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for request in requests:
+                writer.write((json.dumps(request) + '\n').encode())
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await batcher.stop()
+        return {response['id']: response for response in responses}
+
+    responses = asyncio.run(run())
+    for request_id in (1, 2, 3, 4):
+        assert 'error' in responses[request_id]
+    assert 'error' not in responses[5]
+    assert responses[5]['Price'] == pytest.approx(
+        black_scholes.black_scholes_price(100, 100, 1, 0.05, 0.2))